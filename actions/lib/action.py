@@ -5,62 +5,72 @@ import requests
 
 __all__ = ["NetboxBaseAction"]
 
+# how each HTTP verb carries the action parameters
+HTTP_ACTION_PARAMS_KWARG = {
+    "get": "params",
+    "post": "json",
+    "put": "json",
+    "patch": "json",
+    "delete": None,
+}
+
 
 class NetboxBaseAction(Action):
     """Base Action for all Netbox API based actions"""
 
     def __init__(self, config):
         super(NetboxBaseAction, self).__init__(config)
+        # reuse one session across requests so keep-alive and connection
+        # pooling apply when an action hits Netbox more than once
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "Authorization": "Token " + self.config["api_token"],
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            }
+        )
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        protocol = "https" if self.config["use_https"] else "http"
+        self.base_url = f"{protocol}://{self.config['hostname']}/api"
 
     def make_request(self, endpoint_uri, http_action, **kwargs):
         """Logic to make all types of requests"""
 
-        if self.config["use_https"]:
-            url = "https://"
-        else:
-            url = "http://"
-
-        url = url + self.config["hostname"] + "/api" + endpoint_uri
-
-        headers = {
-            "Authorization": "Token " + self.config["api_token"],
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
+        url = self.base_url + endpoint_uri
 
         # transform `in__id` if present
         if kwargs.get("id__in"):
             kwargs["id__in"] = ",".join(kwargs["id__in"])
-            self.logger.debug("id__in transformed to {}".format(kwargs["id__in"]))
+            self.logger.debug("id__in transformed to %s", kwargs["id__in"])
 
         # transform `tags` if present
         if kwargs.get("tags"):
             kwargs["tags"] = ",".join(kwargs["tags"])
-            self.logger.debug("tags transformed to {}".format(kwargs["tags"]))
+            self.logger.debug("tags transformed to %s", kwargs["tags"])
 
-        # strip values which have a None value if we are making a write request
-        if http_action != "get":
+        # strip values which have a None value if we are making a write request,
+        # reusing the original dict when there is nothing to strip
+        if http_action != "get" and any(value is None for value in kwargs.values()):
             kwargs = {key: value for key, value in kwargs.items() if value is not None}
 
-        self.logger.debug("Calling base {} with kwargs: {}".format(http_action, kwargs))
-        verify = self.config["ssl_verify"]
-
-        if http_action == "get":
-            r = requests.get(url, verify=verify, headers=headers, params=kwargs)
-
-        elif http_action == "post":
-            r = requests.post(url, verify=verify, headers=headers, json=kwargs)
+        self.logger.debug("Calling base %s with kwargs: %s", http_action, kwargs)
 
-        elif http_action == "put":
-            r = requests.put(url, verify=verify, headers=headers, json=kwargs)
+        # verify must stay a per-request kwarg: requests only honors a
+        # session-level verify=False until REQUESTS_CA_BUNDLE/CURL_CA_BUNDLE
+        # environment settings override it
+        request_kwargs = {"verify": self.config["ssl_verify"]}
+        params_kwarg = HTTP_ACTION_PARAMS_KWARG[http_action]
+        if params_kwarg:
+            request_kwargs[params_kwarg] = kwargs
 
-        elif http_action == "patch":
-            r = requests.patch(url, verify=verify, headers=headers, json=kwargs)
+        r = self.session.request(http_action.upper(), url, **request_kwargs)
 
-        elif http_action == "delete":
-            r = requests.delete(url, verify=verify, headers=headers)
+        if http_action == "delete":
             self.logger.info(
-                "Delete of ID {} returned status code {}".format(kwargs["id"], r.status_code)
+                "Delete of ID %s returned status code %s", kwargs["id"], r.status_code
             )
 
         return r
@@ -1,4 +1,4 @@
-import json
+import orjson
 
 from lib.action import NetboxBaseAction
 from st2client.client import Client
@@ -10,6 +10,15 @@ class NetboxHTTPAction(NetboxBaseAction):
     Base run action
     """
 
+    _st2_client = None
+
+    def _get_st2_client(self):
+        if self._st2_client is None:
+            # FIXME: This shouldn't be hard coded and will break on systems where the api
+            #        is not listening on localhost.
+            self._st2_client = Client(base_url="http://localhost")
+        return self._st2_client
+
     def run(self, endpoint_uri, http_verb, get_detail_route_eligible, **kwargs):
         """
         Base run action
@@ -38,22 +47,25 @@ class NetboxHTTPAction(NetboxBaseAction):
                     )
                 else:
                     # save the result in the st2 keystore
-                    # FIXME: This shouldn't be hard coded and will break on systems where the api
-                    #        is not listening on localhost.
-                    client = Client(base_url="http://localhost")
-                    # FIXME: This call could raise exceptions and should probably be caught and
-                    #        handled correctly for better error reporting to users.
-                    client.keys.update(
-                        KeyValuePair(
-                            name=key_name,
-                            value=json.dumps(result.json()),
-                            ttl=kwargs["save_in_key_store_ttl"],
+                    try:
+                        self._get_st2_client().keys.update(
+                            KeyValuePair(
+                                name=key_name,
+                                # the body is already serialized JSON from the server,
+                                # so store it as-is rather than decoding and re-encoding
+                                value=result.text,
+                                ttl=kwargs["save_in_key_store_ttl"],
+                            )
                         )
-                    )
-
-                    return_status = True
-                    return_result = "Result stored in st2 key {}".format(key_name)
+                    except Exception as e:
+                        return_status, return_result = (
+                            False,
+                            "Failed to store result in st2 key {}: {}".format(key_name, e),
+                        )
+                    else:
+                        return_status = True
+                        return_result = "Result stored in st2 key {}".format(key_name)
         else:
-            return_result = result.json()
+            return_result = orjson.loads(result.content)
 
         return (return_status, {"raw": return_result})
@@ -1,55 +1,75 @@
 #!/usr/bin/env python
 
 import argparse
+import asyncio
+import concurrent.futures
 import datetime
+import aiohttp
 import jinja2
-import json
+import orjson
 import os
-import urllib.request, urllib.error, urllib.parse
+import pathlib
+import sys
 
 
 def get_spec_on_disk(path):
-    spec = None
-    with open(path, "r") as f:
-        spec = f.readlines()
-    return json.loads("\n".join(spec))
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
 
-def get_spec(host, https, port, file_, save_spec=False):
+async def get_spec(host, https, port, file_, save_spec=False):
     if file_:
         return get_spec_on_disk(host)
     else:
-        return get_spec_via_http(host, https, port, save_spec)
+        return await get_spec_via_http(host, https, port, save_spec)
 
-def get_spec_via_http(host, https, port, save_spec=False):
+async def get_spec_via_http(host, https, port, save_spec=False):
     protocol = 'https://' if https else 'http://'
     url = "{}{}:{}/api/swagger.json".format(protocol, host, port)
-    request = urllib.request.Request(url)
     print("Getting API spec from NetBox instance...")
     try:
-        response = urllib.request.urlopen(request)
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url, raise_for_status=True) as response:
+                # orjson parses a bytes buffer in one shot, so hand it the
+                # raw body without an intermediate text decode
+                raw_spec = await response.read()
     except Exception as e:
         print("Failed to get the API spec! {}".format(str(e)))
         exit(1)
-    spec = json.loads(response.read())
     if save_spec:
-        with open("/tmp/netbox_swagger.json", "w") as f:
-            f.write(json.dumps(spec))
-    return spec
+        with open("/tmp/netbox_swagger.json", "wb") as f:
+            f.write(raw_spec)
+    return orjson.loads(raw_spec)
+
+
+def load_template():
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(os.path.dirname(__file__)),
+        autoescape=False,
+        optimized=True,
+        auto_reload=False,
+    )
+    return env.get_template('action-template.jinja2')
+
+
+def sanitize_parameter(parameter):
+    name = parameter['name']
+    if name.endswith('_id'):
+        parameter['type'] = "integer"
+    elif name == 'id__in':
+        parameter['type'] = "array"
+        parameter['description'] = "Array of IDs"
+    elif name == 'tags':
+        parameter['type'] = "array"
+        parameter['description'] = "Array of tag strings"
+
+    if parameter['type'] == 'number':
+        parameter['type'] = 'integer'
+    return parameter
 
 
 def sanitize_parameters(parameters):
     for parameter in parameters:
-        if parameter['name'].endswith('_id'):
-            parameter['type'] = "integer"
-        elif parameter['name'] == 'id__in':
-            parameter['type'] = "array"
-            parameter['description'] = "Array of IDs"
-        elif parameter['name'] == 'tags':
-            parameter['type'] = "array"
-            parameter['description'] = "Array of tag strings"
-
-        if parameter['type'] == 'number':
-            parameter['type'] = 'integer'
+        sanitize_parameter(parameter)
     return parameters
 
 
@@ -66,7 +86,7 @@ def parse_properties(properties, required, spec, ignore=None):
         ignore(list): optional list of elements to explicitly ignore
     """
     parameters = []
-    for name, data in list(properties.items()):
+    for name, data in properties.items():
         if data.get('readOnly', False):
             continue
 
@@ -100,21 +120,65 @@ def parse_properties(properties, required, spec, ignore=None):
         else:
             parameter['required'] = False
 
-        parameters.append(parameter)
+        parameters.append(sanitize_parameter(parameter))
 
-    return sanitize_parameters(parameters)
+    return parameters
 
 
-def run(spec):
+DASH_TO_UNDERSCORE = str.maketrans('-', '_')
+
+# shared parameter definitions appended to many actions; they are only ever
+# read after this point, so a single instance can be reused across actions
+PREFIX_ID_PARAMETER = {
+    'name': 'id',
+    'required': True,
+    'description': "ID of the Prefix.",
+    'type': 'integer'
+}
+
+OBJECT_ID_PARAMETER = {
+    'name': 'id',
+    'required': True,
+    'description': "ID of the object.",
+    'type': 'integer'
+}
+
+WRITE_VERB_ID_PARAMETERS = {
+    verb: {
+        'name': 'id',
+        'required': True,
+        'description': "ID of the object to {}.".format(verb),
+        'type': 'integer'
+    }
+    for verb in ('delete', 'put', 'patch')
+}
+
+DETAIL_ROUTE_ID_PARAMETER = {
+    'name': 'id',
+    'required': False,
+    'description': 'If provided, will convert to using the detail route. '
+                   'I.e., <endpoint_uri>/<id>/, '
+                   'meaning a max of one entity will be returned and all '
+                   'other entity query parameters will be ignored.',
+    'type': 'integer'
+}
+
+
+def run(spec, template):
     actions = {}
     deferred_detail_gets = []
-    for path, verbs in list(spec['paths'].items()):
-        path_parts = [x.replace("-", "_") for x in path.replace("/{id}", "").strip("/").split("/")]
-        for verb, verb_data in list(verbs.items()):
+    # buffer per-endpoint progress lines and emit them in one write at the
+    # end rather than paying a print per (path, verb) pair
+    log_lines = []
+    for path, verbs in spec['paths'].items():
+        path_parts = (
+            path.replace("/{id}", "").strip("/").translate(DASH_TO_UNDERSCORE).split("/")
+        )
+        for verb, verb_data in verbs.items():
             if verb == 'parameters':
                 continue
 
-            print("Action: {} {}".format(verb, path_parts))
+            log_lines.append("Action: {} {}".format(verb, path_parts))
 
             action_name = "{}.{}".format(verb, ".".join(path_parts))
             if "{id}" in path:
@@ -149,12 +213,7 @@ def run(spec):
                 action['parameters'] = parse_properties(
                     schema['properties'], schema['required'], spec, ['address']
                 )
-                action['parameters'].append({
-                    'name': 'id',
-                    'required': True,
-                    'description': "ID of the Prefix.",
-                    'type': 'integer'
-                })
+                action['parameters'].append(PREFIX_ID_PARAMETER)
                 action['get_detail_route_eligible'] = False
                 action['description'] = "Create the next available IP Address in a given Prefix."
                 actions[action_name] = action
@@ -166,12 +225,7 @@ def run(spec):
                 action['parameters'] = parse_properties(
                     schema['properties'], schema['required'], spec, ['prefix']
                 )
-                action['parameters'].append({
-                    'name': 'id',
-                    'required': True,
-                    'description': "ID of the Prefix.",
-                    'type': 'integer'
-                })
+                action['parameters'].append(PREFIX_ID_PARAMETER)
                 action['parameters'].append({
                     'name': 'prefix_length',
                     'required': True,
@@ -214,72 +268,65 @@ def run(spec):
                 deferred_detail_gets.append(action_name)
 
             elif verb == 'get' and "{{ id }}" in path and not path.endswith("{{ id }}"):
-                action['parameters'].append({
-                    'name': 'id',
-                    'required': True,
-                    'description': "ID of the object.",
-                    'type': 'integer'
-                })
+                action['parameters'].append(OBJECT_ID_PARAMETER)
                 action['get_detail_route_eligible'] = False
                 actions[action_name] = action
 
             elif verb in ['delete', 'put', 'patch']:
-                action['parameters'].append({
-                    'name': 'id',
-                    'required': True,
-                    'description': "ID of the object to {}.".format(verb),
-                    'type': 'integer'
-                })
+                action['parameters'].append(WRITE_VERB_ID_PARAMETERS[verb])
                 actions[action_name] = action
 
             elif verb == 'post' and "{{ id }}" not in path:
                 actions[action_name] = action
 
             else:
-                print(("Unable to process endpoint {}, no defined logic".format(action_name)))
+                log_lines.append(
+                    "Unable to process endpoint {}, no defined logic".format(action_name)
+                )
 
     # process defered detail get endpoints
     for detailed_get in deferred_detail_gets:
         list_action = actions.get(detailed_get)
         if list_action is not None:
-            list_action['parameters'].append({
-                'name': 'id',
-                'required': False,
-                'description': 'If provided, will convert to using the detail route. '
-                               'I.e., <endpoint_uri>/<id>/, '
-                               'meaning a max of one entity will be returned and all '
-                               'other entity query parameters will be ignored.',
-                'type': 'integer'
-            })
+            list_action['parameters'].append(DETAIL_ROUTE_ID_PARAMETER)
         else:
-            print(("Unable to find list action for deferred GET endpoint {}".format(detailed_get)))
+            log_lines.append(
+                "Unable to find list action for deferred GET endpoint {}".format(detailed_get)
+            )
+
+    sys.stdout.write('\n'.join(log_lines) + '\n')
 
     # delete all current ".yaml" action files
     running_dir_name = os.path.dirname(__file__)
     actions_dir = os.path.join(running_dir_name, '../actions')
-    current_actions_listing = os.listdir(actions_dir)
-    for item in current_actions_listing:
-        if item.endswith('.yaml'):
-            os.remove(os.path.join(actions_dir, item))
+    with os.scandir(actions_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.yaml'):
+                os.remove(entry.path)
 
     # render the new actions and write them to file
-    with open('action-template.jinja2') as f:
-        template = jinja2.Template(f.read())
-    for name, action in list(actions.items()):
-        template_vars = {
-            'generation_date': datetime.datetime.now(),
-            'version': spec['info']['version'],
-            'action_name': name,
-            'parameters': action['parameters'],
-            'description': action['description'],
-            'endpoint_uri': action['endpoint_uri'],
-            'verb': action['verb'],
-            'get_detail_route_eligible': action['get_detail_route_eligible'],
-        }
-        rendered_template = template.render(**template_vars)
-        f = open(os.path.join(actions_dir, "{}.yaml".format(name)), 'w')
-        f.write(rendered_template)
-        f.close()
+    base_vars = {
+        'generation_date': datetime.datetime.now(),
+        'version': spec['info']['version'],
+    }
+
+    def render_and_write(item):
+        name, action = item
+        template_vars = dict(
+            base_vars,
+            action_name=name,
+            parameters=action['parameters'],
+            description=action['description'],
+            endpoint_uri=action['endpoint_uri'],
+            verb=action['verb'],
+            get_detail_route_eligible=action['get_detail_route_eligible'],
+        )
+        rendered_template = template.render(template_vars)
+        pathlib.Path(actions_dir, "{}.yaml".format(name)).write_text(rendered_template)
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        # consume the iterator so worker exceptions are raised here
+        list(executor.map(render_and_write, actions.items()))
 
     return len(actions)
 
@@ -311,7 +358,15 @@ if __name__ == "__main__":
     )
     args = parser.parse_args()
 
-    spec = get_spec(args.host, args.https, args.port, args.file)
-    total_actions = run(spec)
+    async def main():
+        # overlap the spec download with template compilation
+        loop = asyncio.get_event_loop()
+        return await asyncio.gather(
+            get_spec(args.host, args.https, args.port, args.file),
+            loop.run_in_executor(None, load_template),
+        )
+
+    spec, template = asyncio.run(main())
+    total_actions = run(spec, template)
     print(("Wrote {} actions to file.".format(total_actions)))
     print("Done!")